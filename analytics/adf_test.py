@@ -1,5 +1,9 @@
-import pandas as pd
-from statsmodels.tsa.stattools import adfuller
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def adf_test(spread: pd.Series, min_length: int = 30):
@@ -14,6 +18,9 @@ def adf_test(spread: pd.Series, min_length: int = 30):
     if spread is None:
         return None, None
 
+    # statsmodels is heavy; import on first use
+    from statsmodels.tsa.stattools import adfuller
+
     spread = spread.dropna()
 
     if len(spread) < min_length:
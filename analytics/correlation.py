@@ -1,4 +1,9 @@
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def rolling_correlation(series_a: pd.Series,
@@ -11,6 +16,8 @@ def rolling_correlation(series_a: pd.Series,
     if series_a is None or series_b is None:
         return None
 
+    import pandas as pd
+
     # Align time indices
     df = pd.concat([series_a, series_b], axis=1, join="inner")
     df.columns = ["a", "b"]
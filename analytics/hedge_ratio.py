@@ -1,5 +1,9 @@
-import pandas as pd
-import statsmodels.api as sm
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def compute_hedge_ratio(series_a: pd.Series,
@@ -15,6 +19,10 @@ def compute_hedge_ratio(series_a: pd.Series,
     if series_a is None or series_b is None:
         return None
 
+    # pandas / statsmodels are heavy; import on first use
+    import pandas as pd
+    import statsmodels.api as sm
+
     # Align time series
     df = pd.concat([series_a, series_b], axis=1, join="inner")
     df.columns = ["a", "b"]
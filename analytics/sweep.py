@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from typing import TYPE_CHECKING
+
+from analytics.adf_test import adf_test
+from analytics.hedge_ratio import compute_hedge_ratio
+from analytics.spread import compute_spread
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _rolling_sums(x, windows):
+    """
+    Trailing-window sums of x for every window at every bar, from a single
+    cumulative sum. Shape (len(windows), len(x)); NaN until a window fills.
+    """
+    import numpy as np
+
+    n = len(x)
+    cs = np.concatenate(([0.0], np.cumsum(x)))
+    end = np.arange(1, n + 1)[None, :]
+    start = end - np.asarray(windows)[:, None]
+
+    sums = cs[end] - cs[np.clip(start, 0, None)]
+    return np.where(start >= 0, sums, np.nan)
+
+
+def _window_stats(spread, a, b, windows):
+    """
+    Rolling z-score of the spread and rolling correlation of a / b,
+    for all windows at once. Both shaped (len(windows), len(spread)).
+
+    Matches compute_zscore (sample std, 0 when flat) and
+    rolling_correlation bar by bar.
+    """
+    import numpy as np
+
+    # Centre first so the cumulative sums don't lose precision
+    spread = spread - spread.mean()
+    a = a - a.mean()
+    b = b - b.mean()
+
+    w = np.asarray(windows, dtype=float)[:, None]
+
+    s_sum = _rolling_sums(spread, windows)
+    s_var = (_rolling_sums(spread * spread, windows) - s_sum ** 2 / w) / (w - 1)
+    s_std = np.sqrt(np.clip(s_var, 0, None))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(s_std > 0, (spread[None, :] - s_sum / w) / s_std, 0.0)
+    z[np.isnan(s_sum)] = np.nan
+
+    a_sum = _rolling_sums(a, windows)
+    b_sum = _rolling_sums(b, windows)
+    cov = _rolling_sums(a * b, windows) - a_sum * b_sum / w
+    a_var = _rolling_sums(a * a, windows) - a_sum ** 2 / w
+    b_var = _rolling_sums(b * b, windows) - b_sum ** 2 / w
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = np.sqrt(a_var * b_var)
+        corr = np.where(denom > 0, cov / denom, np.nan)
+
+    return z, corr
+
+
+def _evaluate_windows(spread, a, b, windows, z_thresholds, corr_thresholds,
+                      horizon, start=0):
+    """
+    Signal counts and hit statistics for every (window, z, corr) cell,
+    over bars from `start` on.
+
+    A signal is a bar where |z| >= z_thresh and corr >= corr_thresh.
+    It is a hit when the spread `horizon` bars later is closer to its
+    mean than at the signal, i.e. -sign(z) * (spread[t + horizon] -
+    spread[t]) > 0. Per window, all threshold pairs are evaluated in one
+    pass as indicator-matrix products.
+    """
+    import numpy as np
+
+    n = len(spread)
+    z, corr = _window_stats(spread, a, b, windows)
+    # Bars before start only warm up the rolling windows
+    z[:, :start] = np.nan
+
+    forward = np.full(n, np.nan)
+    if horizon < n:
+        forward[:n - horizon] = spread[horizon:] - spread[:n - horizon]
+
+    zt = np.asarray(z_thresholds, dtype=float)[:, None]
+    ct = np.asarray(corr_thresholds, dtype=float)[:, None]
+
+    shape = (len(windows), len(z_thresholds), len(corr_thresholds))
+    signals = np.zeros(shape)
+    evaluated = np.zeros(shape)
+    hits = np.zeros(shape)
+    reversion = np.zeros(shape)
+
+    for i in range(len(windows)):
+        # NaN comparisons are False, matching the None checks in zscore_alert
+        with np.errstate(invalid="ignore"):
+            z_on = (np.abs(z[i]) >= zt).astype(float)
+            corr_on = corr[i] >= ct
+
+        # Positive when the spread reverts toward the mean after the signal
+        move = -np.sign(z[i]) * forward
+        known = ~np.isnan(move)
+        move = np.where(known, move, 0.0)
+
+        signals[i] = z_on @ corr_on.T.astype(float)
+        evaluated[i] = z_on @ (corr_on & known).T.astype(float)
+        hits[i] = z_on @ (corr_on & (move > 0)).T.astype(float)
+        reversion[i] = z_on @ (corr_on * move).T
+
+    return signals, evaluated, hits, reversion
+
+
+def parameter_sweep(series_a: pd.Series,
+                    series_b: pd.Series,
+                    windows,
+                    z_thresholds,
+                    corr_thresholds,
+                    p_thresholds,
+                    horizon: int = 10,
+                    calibration: float = 0.3,
+                    max_workers: int = None,
+                    parallel_min_cells: int = 20_000_000):
+    """
+    Evaluates zscore_alert over a grid of windows and thresholds.
+
+    The hedge ratio and ADF p-value are fitted on the leading
+    `calibration` share of the bars, and signals are only scored on the
+    bars after it, so no result depends on data it could not have seen.
+    p_thresh gates the whole out-of-sample period at once.
+    Rolling statistics for all windows come from cumulative sums, and
+    grids larger than parallel_min_cells (windows x bars x thresholds)
+    are split by window across a process pool.
+
+    horizon: bars ahead used to score hits, must be >= 1
+    calibration: fraction of bars used to fit hedge / p, in (0, 1)
+
+    Returns:
+    - dict with bars, hedge_ratio, p_value, the fit used (calibration_bars,
+      scored_from) and one result per combination
+    """
+    if horizon < 1:
+        raise ValueError("horizon must be at least 1 bar")
+    if not 0 < calibration < 1:
+        raise ValueError("calibration must be between 0 and 1")
+
+    import numpy as np
+    import pandas as pd
+
+    result = {
+        "bars": 0,
+        "hedge_ratio": None,
+        "p_value": None,
+        "horizon": horizon,
+        "fit": "calibration",
+        "calibration_bars": 0,
+        "scored_from": None,
+        "results": []
+    }
+
+    if series_a is None or series_b is None:
+        return result
+
+    df = pd.concat([series_a, series_b], axis=1, join="inner").dropna()
+    df.columns = ["a", "b"]
+
+    start = int(len(df) * calibration)
+    fit = df.iloc[:start]
+
+    hedge = compute_hedge_ratio(fit["a"], fit["b"])
+    spread = compute_spread(df["a"], df["b"], hedge)
+    if spread is None or start >= len(df):
+        return result
+
+    _, p_value = adf_test(spread.iloc[:start])
+    result.update(
+        bars=len(df),
+        hedge_ratio=hedge,
+        p_value=p_value,
+        calibration_bars=start,
+        scored_from=df.index[start]
+    )
+
+    windows = sorted({int(w) for w in windows if 2 <= int(w) <= len(df)})
+    if not windows:
+        return result
+
+    args = (
+        spread.to_numpy(dtype=float),
+        df["a"].to_numpy(dtype=float),
+        df["b"].to_numpy(dtype=float)
+    )
+    thresholds = (list(z_thresholds), list(corr_thresholds), horizon, start)
+
+    cells = len(windows) * len(df) * (len(z_thresholds) + len(corr_thresholds))
+    workers = max_workers or multiprocessing.cpu_count()
+
+    if cells < parallel_min_cells or workers < 2 or len(windows) < 2:
+        parts = [_evaluate_windows(*args, windows, *thresholds)]
+    else:
+        chunks = [list(c) for c in np.array_split(windows, workers) if len(c)]
+        # spawn, not fork: the API process runs threads holding locks
+        with ProcessPoolExecutor(
+            max_workers=len(chunks),
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            futures = [
+                pool.submit(_evaluate_windows, *args, chunk, *thresholds)
+                for chunk in chunks
+            ]
+            parts = [future.result() for future in futures]
+
+    signals, evaluated, hits, reversion = (
+        np.concatenate(arrays) for arrays in zip(*parts)
+    )
+
+    for p_thresh in p_thresholds:
+        stationary = p_value is not None and p_value < p_thresh
+
+        for i, window in enumerate(windows):
+            for j, z_thresh in enumerate(z_thresholds):
+                for k, corr_thresh in enumerate(corr_thresholds):
+                    count = int(signals[i, j, k]) if stationary else 0
+                    scored = evaluated[i, j, k] if stationary else 0
+
+                    result["results"].append({
+                        "window": window,
+                        "z_thresh": z_thresh,
+                        "corr_thresh": corr_thresh,
+                        "p_thresh": p_thresh,
+                        "signals": count,
+                        "hits": int(hits[i, j, k]) if stationary else 0,
+                        "hit_rate": (
+                            float(hits[i, j, k] / scored) if scored else None
+                        ),
+                        "avg_reversion": (
+                            float(reversion[i, j, k] / scored) if scored else None
+                        )
+                    })
+
+    return result
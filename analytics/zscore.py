@@ -1,5 +1,9 @@
-import numpy as np
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def compute_zscore(spread_series: pd.Series, window: int = 50):
@@ -17,6 +21,8 @@ def compute_zscore(spread_series: pd.Series, window: int = 50):
     if spread_series is None or len(spread_series) < window:
         return None
 
+    import numpy as np
+
     recent = spread_series.iloc[-window:]
     mean = recent.mean()
     std = recent.std()
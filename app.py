@@ -1,18 +1,28 @@
+import backend.startup  # noqa: F401  (starts the cold-start clock)
+
 import asyncio
+import os
 import threading
 import uvicorn
 from ingestion.websocket_client import BinanceWebSocketClient
-from backend.api import app, market_state
+from backend.api import app, ingest_tick
+
+# Overridable so the stack can run against a local fake exchange
+SYMBOLS = os.getenv("SYMBOLS", "btcusdt,ethusdt").split(",")
+WS_URL = os.getenv("BINANCE_WS_URL", BinanceWebSocketClient.BASE_URL)
+PORT = int(os.getenv("PORT", "8000"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "info")
 
 
 def handle_tick(tick):
-    market_state.add_tick(tick)
+    ingest_tick(tick)
 
 
 async def start_ws():
     client = BinanceWebSocketClient(
-        symbols=["btcusdt", "ethusdt"],
-        on_tick_callback=handle_tick
+        symbols=SYMBOLS,
+        on_tick_callback=handle_tick,
+        base_url=WS_URL
     )
     await client.start()
 
@@ -24,8 +34,8 @@ def start_api():
     uvicorn.run(
         app,
         host="0.0.0.0",
-        port=8000,
-        log_level="info"
+        port=PORT,
+        log_level=LOG_LEVEL
     )
 
 
@@ -1,16 +1,72 @@
-from fastapi import FastAPI
+from backend.startup import PROCESS_START, timer, warm_up
+
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from state.market_state import MarketState
 from analytics.hedge_ratio import compute_hedge_ratio
 from analytics.spread import compute_spread
 from analytics.zscore import compute_zscore
 from analytics.correlation import rolling_correlation
 from analytics.adf_test import adf_test
+from analytics.sweep import parameter_sweep
 from alerts.rules import zscore_alert
 
-app = FastAPI(title="Quant Analytics Backend")
+# Global shared state, built by the lifespan hook
+market_state = None
 
-# Global shared state
-market_state = MarketState()
+# Ticks that arrive before market_state exists are replayed into it
+_pending_ticks = deque(maxlen=100_000)
+_state_lock = threading.Lock()
+
+
+def ingest_tick(tick):
+    """
+    Ingestion entry point, safe to call before the app has started.
+    """
+    with _state_lock:
+        if market_state is None:
+            _pending_ticks.append(tick)
+            return
+    market_state.add_tick(tick)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global market_state
+
+    started = time.perf_counter()
+    state = MarketState()
+    timer.record("db_open", time.perf_counter() - started)
+
+    with _state_lock:
+        while _pending_ticks:
+            state.add_tick(_pending_ticks.popleft())
+        market_state = state
+
+    threading.Thread(target=warm_up, args=(timer,), daemon=True).start()
+    timer.mark_ready()
+
+    yield
+
+
+app = FastAPI(title="Quant Analytics Backend", lifespan=lifespan)
+
+
+@app.middleware("http")
+async def time_first_request(request: Request, call_next):
+    if timer.first_request_at is not None:
+        return await call_next(request)
+
+    started = time.perf_counter()
+    response = await call_next(request)
+    timer.record_request(time.perf_counter() - started)
+    return response
 
 
 # ---------------------------------------------------
@@ -23,24 +79,98 @@ def get_symbols():
 
 @app.get("/price")
 def get_latest_price(symbol: str):
-    price = market_state.get_latest_price(symbol)
-    return {"symbol": symbol, "price": price}
+    tick = market_state.get_latest_tick(symbol)
+    return {
+        "symbol": symbol,
+        "price": tick["price"] if tick else None,
+        "ts": tick["ts"] if tick else None
+    }
 
 
 @app.get("/bars")
-def get_bars(symbol: str, timeframe: str = "1m"):
+def get_bars(request: Request,
+             symbol: str,
+             timeframe: str = "1m",
+             since: Optional[int] = None,
+             epoch: Optional[str] = None):
     """
-    timeframe: 1s | 1m | 5m
+    timeframe: 1s | 1m | 5m | tick | volume | dollar
+    since: only return bars created or updated after this seq
+    epoch: the "epoch" the since= seq was issued in
+
+    Every bar carries the seq of the last change to it: its newest tick,
+    or the retention trim that removed part of it. "seq" in the response
+    is the bar-set version to pass as the next since=, and the ETag is
+    derived from it, so a matching If-None-Match gets 304 without
+    resampling.
+
+    Bars are only ever dropped from the old end. "oldest" is the
+    timestamp of the oldest retained bar; clients prune anything before
+    it. At most 100 bars are returned. With since=, "truncated" is true
+    when more than 100 bars changed, and the client should refetch
+    without since=.
+
+    Seqs restart with the backend, so "epoch" identifies the process
+    that issued them and is part of the ETag. A since= from another
+    epoch (or ahead of the current version) can't be trusted, so the
+    full bar set is resent with "truncated" true.
     """
+    version = market_state.get_bars_version(symbol, timeframe)
+    etag = _bars_etag(market_state.epoch, symbol, timeframe, version)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # Every change up to `version` is in df; later ones may be too,
+    # and are simply resent on the next poll
     df = market_state.get_resampled(symbol, timeframe)
 
     if df is None:
-        return {"bars": 0, "data": {}}
+        return {"bars": 0, "seq": 0, "epoch": market_state.epoch,
+                "oldest": None, "truncated": since is not None,
+                "data": {}}
+
+    total = len(df)
+    oldest = df.index[0]
+    truncated = False
+    if since is not None:
+        if epoch != market_state.epoch or since > version:
+            truncated = True
+        else:
+            df = df[df["seq"] > since]
+            truncated = len(df) > 100
+
+    return JSONResponse(
+        jsonable_encoder({
+            "bars": total,
+            "seq": version,
+            "epoch": market_state.epoch,
+            "oldest": oldest,
+            "truncated": truncated,
+            "data": df.tail(100).to_dict()
+        }),
+        headers={"ETag": etag}
+    )
+
+
+def _bars_etag(epoch, symbol, timeframe, seq):
+    return f'"{epoch}-{symbol}-{timeframe}-{seq}"'
+
+
+@app.get("/memory")
+def get_memory():
+    """
+    Per-symbol buffer memory use against the global budget,
+    plus raw-tick and archived-bar coverage in seconds.
+    """
+    return market_state.get_memory_stats()
 
-    return {
-        "bars": len(df),
-        "data": df.tail(100).to_dict()
-    }
+
+@app.get("/startup")
+def get_startup():
+    """
+    Cold-start breakdown: import, DB open, warm-up and first request.
+    """
+    return timer.report()
 
 
 # ---------------------------------------------------
@@ -52,8 +182,7 @@ def zscore(symbol_a: str,
            timeframe: str = "1m",
            window: int = 50):
 
-    s1 = market_state.get_price_series(symbol_a, timeframe)
-    s2 = market_state.get_price_series(symbol_b, timeframe)
+    s1, s2 = market_state.get_pair_series(symbol_a, symbol_b, timeframe)
 
     hedge = compute_hedge_ratio(s1, s2)
     spread = compute_spread(s1, s2, hedge)
@@ -71,8 +200,7 @@ def correlation(symbol_a: str,
                 timeframe: str = "1m",
                 window: int = 50):
 
-    s1 = market_state.get_price_series(symbol_a, timeframe)
-    s2 = market_state.get_price_series(symbol_b, timeframe)
+    s1, s2 = market_state.get_pair_series(symbol_a, symbol_b, timeframe)
 
     corr = rolling_correlation(s1, s2, window)
     return {"correlation": corr}
@@ -83,8 +211,7 @@ def adf(symbol_a: str,
         symbol_b: str,
         timeframe: str = "1m"):
 
-    s1 = market_state.get_price_series(symbol_a, timeframe)
-    s2 = market_state.get_price_series(symbol_b, timeframe)
+    s1, s2 = market_state.get_pair_series(symbol_a, symbol_b, timeframe)
 
     hedge = compute_hedge_ratio(s1, s2)
     spread = compute_spread(s1, s2, hedge)
@@ -97,6 +224,58 @@ def adf(symbol_a: str,
     }
 
 
+@app.get("/analytics/sweep")
+def sweep(symbol_a: str,
+          symbol_b: str,
+          timeframe: str = "1m",
+          source: str = "memory",
+          windows: str = "20,50,100",
+          z_thresh: str = "1.5,2.0,2.5",
+          corr_thresh: str = "0.3,0.5,0.7",
+          p_thresh: str = "0.01,0.05,0.1",
+          horizon: int = 10,
+          calibration: float = 0.3,
+          since: Optional[str] = None,
+          until: Optional[str] = None):
+    """
+    Grid search over zscore_alert parameters on one bar history.
+    source: memory | db
+    calibration: leading fraction of bars used to fit hedge ratio / ADF
+    since / until: ISO8601 bounds on the db history
+    Grids are comma-separated lists.
+    """
+    if source not in ("memory", "db"):
+        raise HTTPException(status_code=400, detail="source must be memory or db")
+    if horizon < 1:
+        raise HTTPException(status_code=400, detail="horizon must be at least 1")
+    if not 0 < calibration < 1:
+        raise HTTPException(status_code=400, detail="calibration must be between 0 and 1")
+
+    try:
+        grid = {
+            "windows": _parse_grid(windows, int),
+            "z_thresholds": _parse_grid(z_thresh, float),
+            "corr_thresholds": _parse_grid(corr_thresh, float),
+            "p_thresholds": _parse_grid(p_thresh, float)
+        }
+    except ValueError:
+        raise HTTPException(status_code=400, detail="grids must be comma-separated numbers")
+
+    try:
+        s1, s2 = market_state.get_pair_series(
+            symbol_a, symbol_b, timeframe, source, since, until
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since/until must be ISO8601")
+
+    return parameter_sweep(s1, s2, horizon=horizon, calibration=calibration,
+                           **grid)
+
+
+def _parse_grid(value, cast):
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
 # ---------------------------------------------------
 # ALERTS
 # ---------------------------------------------------
@@ -106,8 +285,7 @@ def alert(symbol_a: str,
           timeframe: str = "1m",
           window: int = 50):
 
-    s1 = market_state.get_price_series(symbol_a, timeframe)
-    s2 = market_state.get_price_series(symbol_b, timeframe)
+    s1, s2 = market_state.get_pair_series(symbol_a, symbol_b, timeframe)
 
     hedge = compute_hedge_ratio(s1, s2)
     spread = compute_spread(s1, s2, hedge)
@@ -124,3 +302,6 @@ def alert(symbol_a: str,
         "correlation": corr,
         "p_value": p_value
     }
+
+
+timer.record("import", time.perf_counter() - PROCESS_START)
@@ -0,0 +1,72 @@
+import threading
+import time
+
+# Reference point for every phase; import this module first
+PROCESS_START = time.perf_counter()
+
+
+class StartupTimer:
+    """
+    Cold-start breakdown for the backend:
+    - import: process start -> API module imported
+    - db_open: MarketState construction (SQLite connection + schema)
+    - warm_up: background import of pandas / statsmodels
+    - first_request: latency of the first served request
+    """
+
+    PHASES = ("import", "db_open", "warm_up", "first_request")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.phases = {}
+        self.ready_at = None
+        self.first_request_at = None
+
+    def record(self, phase, seconds):
+        with self.lock:
+            self.phases.setdefault(phase, seconds)
+
+    def mark_ready(self):
+        with self.lock:
+            if self.ready_at is None:
+                self.ready_at = time.perf_counter() - PROCESS_START
+
+    def record_request(self, seconds):
+        with self.lock:
+            if self.first_request_at is not None:
+                return
+            self.first_request_at = time.perf_counter() - PROCESS_START
+        self.record("first_request", seconds)
+
+    def report(self):
+        with self.lock:
+            return {
+                "phases_s": {
+                    phase: round(self.phases[phase], 4)
+                    if phase in self.phases else None
+                    for phase in self.PHASES
+                },
+                "ready_after_s": _round(self.ready_at),
+                "first_request_after_s": _round(self.first_request_at)
+            }
+
+
+def _round(value):
+    return round(value, 4) if value is not None else None
+
+
+def warm_up(timer):
+    """
+    Imports the heavy analytics dependencies off the request path,
+    so the first analytics call does not pay for them.
+    """
+    started = time.perf_counter()
+
+    import pandas  # noqa: F401
+    import statsmodels.api  # noqa: F401
+    import statsmodels.tsa.stattools  # noqa: F401
+
+    timer.record("warm_up", time.perf_counter() - started)
+
+
+timer = StartupTimer()
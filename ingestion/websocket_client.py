@@ -13,13 +13,15 @@ class BinanceWebSocketClient:
 
     BASE_URL = "wss://fstream.binance.com/ws"
 
-    def __init__(self, symbols, on_tick_callback, reconnect_delay=5):
+    def __init__(self, symbols, on_tick_callback, reconnect_delay=5,
+                 base_url=None):
         self.symbols = symbols
+        self.base_url = base_url or self.BASE_URL
         self.on_tick = on_tick_callback
         self.reconnect_delay = reconnect_delay
 
     async def _connect_symbol(self, symbol):
-        url = f"{self.BASE_URL}/{symbol}@trade"
+        url = f"{self.base_url}/{symbol}@trade"
 
         while True:
             try:
@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+import websockets
+
+
+def make_symbols(count):
+    """
+    btcusdt, ethusdt, then synthetic sym002usdt, sym003usdt, ...
+    """
+    base = ["btcusdt", "ethusdt"]
+    return (base + [f"sym{i:03d}usdt" for i in range(2, count)])[:count]
+
+
+class FakeExchange:
+    """
+    Local WebSocket server speaking the Binance Futures `trade` stream.
+
+    Serves ws://host:port/ws/<symbol>@trade like fstream.binance.com, at a
+    configurable per-symbol rate with optional bursts and forced disconnects.
+    """
+
+    def __init__(self,
+                 host="127.0.0.1",
+                 port=9001,
+                 rate=50.0,
+                 burst_every=0.0,
+                 burst_duration=1.0,
+                 burst_multiplier=10.0,
+                 disconnect_every=0.0,
+                 batch_interval=0.01):
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.burst_every = burst_every
+        self.burst_duration = burst_duration
+        self.burst_multiplier = burst_multiplier
+        self.disconnect_every = disconnect_every
+        self.batch_interval = batch_interval
+
+        self.started = time.monotonic()
+        self.connections = set()
+        self.prices = {}
+        self.trade_ids = {}
+
+        self.stats = {
+            "sent": 0,
+            "connections": 0,
+            "disconnects_injected": 0
+        }
+
+    # -----------------------------
+    # LOAD SHAPE
+    # -----------------------------
+    def current_rate(self):
+        """
+        Messages/second per symbol right now, including burst windows.
+        """
+        if self.burst_every <= 0:
+            return self.rate
+
+        phase = (time.monotonic() - self.started) % self.burst_every
+        if phase < self.burst_duration:
+            return self.rate * self.burst_multiplier
+        return self.rate
+
+    def _trade_message(self, symbol):
+        price = self.prices.get(symbol, 100.0)
+        price = max(0.01, price * (1 + random.gauss(0, 0.0002)))
+        self.prices[symbol] = price
+
+        trade_id = self.trade_ids.get(symbol, 0) + 1
+        self.trade_ids[symbol] = trade_id
+
+        now_ms = int(time.time() * 1000)
+        return json.dumps({
+            "e": "trade",
+            "E": now_ms,
+            "T": now_ms,
+            "s": symbol.upper(),
+            "t": trade_id,
+            "p": f"{price:.4f}",
+            "q": f"{random.uniform(0.001, 2.0):.3f}",
+            "X": "MARKET",
+            "m": random.random() < 0.5
+        })
+
+    # -----------------------------
+    # SERVER
+    # -----------------------------
+    async def _handler(self, ws, path=None):
+        # websockets < 13 passes path; newer versions expose ws.request
+        path = path or getattr(ws, "path", None) or ws.request.path
+        symbol = path.rstrip("/").split("/")[-1].split("@")[0].lower()
+
+        self.connections.add(ws)
+        self.stats["connections"] += 1
+        carry = 0.0
+        last = time.monotonic()
+
+        try:
+            while True:
+                # Budget from real elapsed time, so send cost and scheduler
+                # jitter don't drag the delivered rate below the target
+                now = time.monotonic()
+                carry += self.current_rate() * (now - last)
+                last = now
+                count = int(carry)
+                carry -= count
+
+                for _ in range(count):
+                    await ws.send(self._trade_message(symbol))
+                self.stats["sent"] += count
+
+                await asyncio.sleep(self.batch_interval)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.connections.discard(ws)
+
+    async def _inject_disconnects(self):
+        while True:
+            await asyncio.sleep(self.disconnect_every)
+            for ws in list(self.connections):
+                await ws.close(code=1011, reason="injected disconnect")
+            self.stats["disconnects_injected"] += 1
+
+    async def serve(self, stop=None):
+        """
+        Runs until `stop` (an asyncio.Event) is set, or forever.
+        """
+        self.started = time.monotonic()
+        stop = stop or asyncio.Event()
+
+        async with websockets.serve(self._handler, self.host, self.port):
+            print(f"[FAKE EXCHANGE] ws://{self.host}:{self.port}/ws")
+            tasks = []
+            if self.disconnect_every > 0:
+                tasks.append(asyncio.create_task(self._inject_disconnects()))
+
+            await stop.wait()
+
+            for task in tasks:
+                task.cancel()
+
+
+def add_exchange_args(parser):
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--rate", type=float, default=50.0,
+                        help="trades/second per symbol")
+    parser.add_argument("--burst-every", type=float, default=0.0,
+                        help="seconds between bursts (0 = no bursts)")
+    parser.add_argument("--burst-duration", type=float, default=1.0)
+    parser.add_argument("--burst-multiplier", type=float, default=10.0)
+    parser.add_argument("--disconnect-every", type=float, default=0.0,
+                        help="seconds between forced disconnects (0 = never)")
+
+
+def exchange_from_args(args):
+    return FakeExchange(
+        host=args.host,
+        port=args.port,
+        rate=args.rate,
+        burst_every=args.burst_every,
+        burst_duration=args.burst_duration,
+        burst_multiplier=args.burst_multiplier,
+        disconnect_every=args.disconnect_every
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Binance trade stream")
+    add_exchange_args(parser)
+
+    try:
+        asyncio.run(exchange_from_args(parser.parse_args()).serve())
+    except KeyboardInterrupt:
+        print("Shutting down...")
@@ -0,0 +1,333 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+
+import requests
+
+from loadtest.fake_exchange import (
+    add_exchange_args,
+    exchange_from_args,
+    make_symbols
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Bounded so multi-hour soaks don't grow the harness itself
+MAX_SAMPLES = 200_000
+
+# Steady-state samples needed before RSS growth is extrapolated per hour
+MIN_GROWTH_SAMPLES = 3
+
+
+def percentiles(samples):
+    """
+    p50 / p95 / p99 / max in milliseconds.
+    """
+    if not samples:
+        return None
+
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def pick(q):
+        return round(ordered[min(last, int(q * len(ordered)))] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2)
+    }
+
+
+def read_rss_mb(pid):
+    """
+    Resident set size of a process from /proc (Linux only).
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+class LoadHarness:
+    """
+    Runs fake exchange -> app.py -> API end to end and measures:
+    - sustained ingested ticks/second
+    - tick-to-queryable latency (exchange event time -> visible on /price)
+    - backend RSS over time
+    - API latency per endpoint under concurrent clients
+    """
+
+    ENDPOINTS = [
+        ("/bars", lambda a, b: {"symbol": a, "timeframe": "1m"}),
+        ("/analytics/zscore", lambda a, b: {"symbol_a": a, "symbol_b": b}),
+        ("/analytics/correlation", lambda a, b: {"symbol_a": a, "symbol_b": b}),
+        ("/alerts/zscore", lambda a, b: {"symbol_a": a, "symbol_b": b})
+    ]
+
+    def __init__(self, exchange, symbols, api_port=8050, clients=4,
+                 probe_interval=0.01, report_every=10.0):
+        self.exchange = exchange
+        self.symbols = symbols
+        self.api_port = api_port
+        self.base_url = f"http://127.0.0.1:{api_port}"
+        self.clients = clients
+        self.probe_interval = probe_interval
+        self.report_every = report_every
+
+        self.stop = threading.Event()
+        self.proc = None
+        self.workdir = None
+
+        self.samples_lock = threading.Lock()
+        self.tick_latency = deque(maxlen=MAX_SAMPLES)
+        self.api_latency = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+        self.api_errors = defaultdict(int)
+        self.timeline = []
+
+    # -----------------------------
+    # STACK
+    # -----------------------------
+    def _start_exchange(self):
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self._exchange_loop = loop
+            self._exchange_stop = asyncio.Event()
+            ready.set()
+            loop.run_until_complete(self.exchange.serve(self._exchange_stop))
+
+        threading.Thread(target=run, daemon=True).start()
+        ready.wait()
+
+    def _stop_exchange(self):
+        self._exchange_loop.call_soon_threadsafe(self._exchange_stop.set)
+
+    def _start_backend(self):
+        # Fresh cwd so the backend gets its own ticks.db
+        self.workdir = tempfile.mkdtemp(prefix="quant_loadtest_")
+        env = dict(
+            os.environ,
+            PYTHONPATH=REPO_ROOT,
+            SYMBOLS=",".join(self.symbols),
+            BINANCE_WS_URL=f"ws://{self.exchange.host}:{self.exchange.port}/ws",
+            PORT=str(self.api_port),
+            LOG_LEVEL="warning"
+        )
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.join(REPO_ROOT, "app.py")],
+            cwd=self.workdir,
+            env=env
+        )
+
+    def _wait_ready(self, timeout=60.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError("backend exited during startup")
+            try:
+                r = requests.get(f"{self.base_url}/symbols", timeout=1)
+                if r.ok and r.json()["symbols"]:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError("backend not ready before timeout")
+
+    # -----------------------------
+    # WORKERS
+    # -----------------------------
+    def _probe(self):
+        """
+        Polls /price and records now - event time for each new tick seen.
+        Resolution is bounded by probe_interval.
+        """
+        session = requests.Session()
+        symbol = self.symbols[0]
+        last_ts = None
+
+        while not self.stop.is_set():
+            try:
+                r = session.get(f"{self.base_url}/price",
+                                params={"symbol": symbol}, timeout=5)
+                ts = r.json().get("ts")
+                if ts and ts != last_ts:
+                    latency = time.time() - datetime.fromisoformat(ts).timestamp()
+                    with self.samples_lock:
+                        self.tick_latency.append(latency)
+                    last_ts = ts
+            except (requests.RequestException, ValueError):
+                pass
+            time.sleep(self.probe_interval)
+
+    def _client(self, index):
+        session = requests.Session()
+        a = self.symbols[index % len(self.symbols)]
+        b = self.symbols[(index + 1) % len(self.symbols)]
+        i = index
+
+        while not self.stop.is_set():
+            path, params = self.ENDPOINTS[i % len(self.ENDPOINTS)]
+            i += 1
+
+            started = time.perf_counter()
+            try:
+                r = session.get(f"{self.base_url}{path}",
+                                params=params(a, b), timeout=30)
+                r.raise_for_status()
+            except requests.RequestException:
+                with self.samples_lock:
+                    self.api_errors[path] += 1
+                time.sleep(0.1)
+                continue
+
+            with self.samples_lock:
+                self.api_latency[path].append(time.perf_counter() - started)
+
+    def _sample(self, started, last):
+        now = time.monotonic()
+        try:
+            memory = requests.get(f"{self.base_url}/memory", timeout=10).json()
+            ingested = memory.get("ingested", 0)
+        except (requests.RequestException, ValueError):
+            memory, ingested = {}, last["ingested"]
+
+        point = {
+            "elapsed_s": round(now - started, 1),
+            "ingested": ingested,
+            "ticks_per_s": round(
+                (ingested - last["ingested"]) / max(now - last["at"], 1e-9), 1
+            ),
+            "sent": self.exchange.stats["sent"],
+            "rss_mb": read_rss_mb(self.proc.pid),
+            "state_bytes": memory.get("used_bytes")
+        }
+        with self.samples_lock:
+            point["tick_latency"] = percentiles(self.tick_latency)
+
+        self.timeline.append(point)
+        last.update(ingested=ingested, at=now)
+        return point
+
+    # -----------------------------
+    # RUN
+    # -----------------------------
+    def run(self, duration):
+        self._start_exchange()
+        self._start_backend()
+
+        try:
+            self._wait_ready()
+
+            workers = [threading.Thread(target=self._probe, daemon=True)]
+            workers += [
+                threading.Thread(target=self._client, args=(i,), daemon=True)
+                for i in range(self.clients)
+            ]
+            for worker in workers:
+                worker.start()
+
+            started = time.monotonic()
+            last = {"ingested": 0, "at": started}
+            while time.monotonic() - started < duration:
+                time.sleep(min(self.report_every,
+                               max(0.0, duration - (time.monotonic() - started))))
+                print(json.dumps(self._sample(started, last)), flush=True)
+
+            self.stop.set()
+            for worker in workers:
+                worker.join(timeout=35)
+
+            return self.report(duration)
+        finally:
+            self.stop.set()
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+            self._stop_exchange()
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def report(self, duration):
+        # First interval includes warm-up, skip it when there are others
+        steady = self.timeline[1:] or self.timeline
+        rates = [p["ticks_per_s"] for p in steady]
+        rss = [p for p in steady if p["rss_mb"] is not None]
+
+        memory = None
+        if rss:
+            first, last = rss[0], rss[-1]
+            growth = None
+            # Short runs are dominated by noise; don't scale them to an hour
+            if len(rss) >= MIN_GROWTH_SAMPLES:
+                hours = max(last["elapsed_s"] - first["elapsed_s"], 1e-9) / 3600
+                growth = round((last["rss_mb"] - first["rss_mb"]) / hours, 1)
+
+            memory = {
+                "start_mb": round(first["rss_mb"], 1),
+                "end_mb": round(last["rss_mb"], 1),
+                "peak_mb": round(max(p["rss_mb"] for p in rss), 1),
+                "growth_mb_per_hour": growth
+            }
+
+        with self.samples_lock:
+            return {
+                "duration_s": duration,
+                "symbols": len(self.symbols),
+                "exchange": dict(self.exchange.stats),
+                "ticks_per_s": {
+                    "sustained_avg": round(sum(rates) / len(rates), 1) if rates else None,
+                    "min_interval": min(rates) if rates else None
+                },
+                "tick_to_queryable": percentiles(self.tick_latency),
+                "memory": memory,
+                "api": {
+                    path: {
+                        "latency": percentiles(samples),
+                        "errors": self.api_errors[path]
+                    }
+                    for path, samples in self.api_latency.items()
+                }
+            }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="End-to-end load / soak test against a fake exchange"
+    )
+    add_exchange_args(parser)
+    parser.add_argument("--symbols", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=60.0,
+                        help="seconds to run (hours for a soak: 3600 * N)")
+    parser.add_argument("--clients", type=int, default=4,
+                        help="concurrent API client threads")
+    parser.add_argument("--api-port", type=int, default=8050)
+    parser.add_argument("--report-every", type=float, default=10.0)
+    args = parser.parse_args()
+
+    harness = LoadHarness(
+        exchange_from_args(args),
+        make_symbols(args.symbols),
+        api_port=args.api_port,
+        clients=args.clients,
+        report_every=args.report_every
+    )
+    print(json.dumps(harness.run(args.duration), indent=2))
@@ -0,0 +1,90 @@
+from collections import deque
+
+
+BAR_TYPES = ("tick", "volume", "dollar")
+
+
+class InformationBarBuilder:
+    """
+    Incremental tick / volume / dollar bar construction.
+
+    A bar closes once the accumulated measure (trade count, base-asset
+    quantity or quote notional) reaches the threshold. Each update is O(1).
+    """
+
+    def __init__(self, bar_type, threshold, max_bars=5_000):
+        if bar_type not in BAR_TYPES:
+            raise ValueError(f"Unknown bar type: {bar_type}")
+        if threshold <= 0:
+            raise ValueError("threshold must be positive")
+
+        self.bar_type = bar_type
+        self.threshold = threshold
+        self.bars = deque(maxlen=max_bars)
+        self.current = None
+        self.accumulated = 0.0
+
+    def _measure(self, price, qty):
+        if self.bar_type == "tick":
+            return 1
+        if self.bar_type == "volume":
+            return qty
+        return price * qty
+
+    def update(self, tick, seq=None):
+        """
+        Folds one normalized tick into the open bar.
+        seq is the ingest sequence number stamped on the bar as its version.
+        Returns the completed bar dict if this tick closed one, else None.
+        """
+        price = tick["price"]
+        qty = tick["qty"]
+        bar = self.current
+
+        if bar is None:
+            bar = self.current = {
+                "start": tick["ts"],
+                "ts": tick["ts"],
+                "open": price,
+                "high": price,
+                "low": price,
+                "close": price,
+                "volume": 0.0,
+                "dollar_volume": 0.0,
+                "ticks": 0
+            }
+
+        if price > bar["high"]:
+            bar["high"] = price
+        if price < bar["low"]:
+            bar["low"] = price
+        bar["close"] = price
+        bar["ts"] = tick["ts"]
+        bar["volume"] += qty
+        bar["dollar_volume"] += price * qty
+        bar["ticks"] += 1
+        bar["seq"] = seq
+
+        self.accumulated += self._measure(price, qty)
+        if self.accumulated < self.threshold:
+            return None
+
+        self.bars.append(bar)
+        self.current = None
+        self.accumulated = 0.0
+        return bar
+
+    @property
+    def last_seq(self):
+        """
+        Sequence number of the newest completed bar (0 if none).
+        """
+        if not self.bars:
+            return 0
+        return self.bars[-1]["seq"] or 0
+
+    def get_bars(self):
+        """
+        Completed bars, oldest first.
+        """
+        return list(self.bars)
@@ -9,6 +9,6 @@ class Resampler:
 
     def resample(self, symbol, timeframe):
         """
-        timeframe: '1s', '1m', '5m'
+        timeframe: '1s', '1m', '5m', 'tick', 'volume', 'dollar'
         """
         return self.market_state.get_resampled(symbol, timeframe)
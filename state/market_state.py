@@ -1,22 +1,136 @@
 from collections import deque, defaultdict
+import sys
 import threading
 import sqlite3
-import pandas as pd
-from datetime import datetime
+import uuid
+from datetime import datetime, timezone
+from resampling.bars import BAR_TYPES, InformationBarBuilder
+
+
+def _estimate_size(record):
+    """
+    Approximate in-memory footprint (bytes) of a flat dict record.
+    """
+    size = sys.getsizeof(record)
+    for key, value in record.items():
+        size += sys.getsizeof(key) + sys.getsizeof(value)
+    return size
+
+
+def _to_epoch(ts):
+    return datetime.fromisoformat(ts).timestamp()
+
+
+def _to_db_ts(ts):
+    """
+    Normalizes an ISO8601 bound to the UTC format stored in the ticks table.
+    Bounds without an offset are taken as UTC, like the stored ticks.
+    """
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
+
+TIME_RULES = {
+    "1s": "1S",
+    "1m": "1T",
+    "5m": "5T"
+}
+
+
+def _resample_ticks(df, timeframe):
+    """
+    OHLCV (+ seq, when the ticks carry one) bars from a tick DataFrame
+    indexed by ts.
+    """
+    rule = TIME_RULES[timeframe]
+
+    ohlcv = df["price"].resample(rule).ohlc()
+    ohlcv["volume"] = df["qty"].resample(rule).sum()
+    if "seq" in df:
+        ohlcv["seq"] = df["seq"].resample(rule).max()
+    ohlcv.dropna(inplace=True)
+    if "seq" in df:
+        ohlcv["seq"] = ohlcv["seq"].astype("int64")
+
+    return ohlcv
 
 
 class MarketState:
     """
     Central in-memory + persistent market state.
     Owns:
-    - Raw tick storage
+    - Raw tick storage (time horizon + memory budget)
+    - Downsampled bar archive for ticks aged out of the raw buffer
+    - Incremental tick / volume / dollar bars
     - SQLite persistence
     - Resampled data cache
     """
 
-    def __init__(self, max_ticks=10_000, db_path="ticks.db"):
-        self.max_ticks = max_ticks
-        self.data = defaultdict(lambda: deque(maxlen=self.max_ticks))
+    def __init__(self,
+                 retention_seconds=900,
+                 bar_seconds=60,
+                 bar_retention_seconds=86_400,
+                 memory_budget_bytes=128 * 1024 * 1024,
+                 bar_thresholds=None,
+                 max_info_bars=5_000,
+                 info_bar_share=0.25,
+                 db_path="ticks.db"):
+        self.retention_seconds = retention_seconds
+        self.bar_seconds = bar_seconds
+        self.bar_retention_seconds = bar_retention_seconds
+        self.memory_budget_bytes = memory_budget_bytes
+        self.db_path = db_path
+
+        # Raw ticks, their epoch times, ingest sequence numbers and sizes
+        # (kept in lockstep)
+        self.data = defaultdict(deque)
+        self.tick_times = defaultdict(deque)
+        self.tick_seqs = defaultdict(deque)
+        self.tick_sizes = defaultdict(deque)
+
+        # Ticks evicted from the raw buffer are folded into bars here
+        self.archive = defaultdict(deque)
+        self.bar_sizes = defaultdict(deque)
+
+        self.memory_used = defaultdict(int)
+
+        # Monotonic ingest counter; bars carry the seq of their last tick.
+        # It restarts with the process, so seqs are only comparable
+        # within one epoch
+        self.epoch = uuid.uuid4().hex[:12]
+        self.sequence = 0
+        self.latest_seq = defaultdict(int)
+
+        # (epoch, seq) of the newest raw tick / archive bar dropped from a
+        # symbol; the time bar that lost data is re-stamped with that seq
+        self.tick_trim = {}
+        self.archive_trim = {}
+
+        # seq at which a symbol's information bars were last trimmed
+        self.info_trim = defaultdict(dict)
+
+        # Information-driven bars, built on ingest
+        self.bar_thresholds = {
+            "tick": 100,
+            "volume": 50.0,
+            "dollar": 1_000_000.0
+        }
+        if bar_thresholds:
+            self.bar_thresholds.update(bar_thresholds)
+        self.max_info_bars = max_info_bars
+        self.info_bar_share = info_bar_share
+        self.info_bars = defaultdict(self._new_bar_builders)
+
+        # Sizes of completed information bars, per symbol and bar type
+        self.info_bar_sizes = defaultdict(
+            lambda: {bar_type: deque() for bar_type in BAR_TYPES}
+        )
+        self.info_bar_bytes = defaultdict(
+            lambda: {bar_type: 0 for bar_type in BAR_TYPES}
+        )
+
         self.lock = threading.Lock()
 
         # --- SQLite persistence ---
@@ -27,7 +141,10 @@ class MarketState:
         self.resampled = {
             "1s": {},
             "1m": {},
-            "5m": {}
+            "5m": {},
+            "tick": {},
+            "volume": {},
+            "dollar": {}
         }
 
     # -----------------------------
@@ -43,6 +160,10 @@ class MarketState:
                     qty REAL
                 )
             """)
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ticks_symbol_ts
+                ON ticks (symbol, ts)
+            """)
 
     # -----------------------------
     # INGESTION
@@ -57,9 +178,35 @@ class MarketState:
         }
         """
         symbol = tick["symbol"]
+        epoch = _to_epoch(tick["ts"])
+        size = _estimate_size(tick)
 
         with self.lock:
+            is_new = symbol not in self.data
+            self.sequence += 1
+            seq = self.sequence
+            self.latest_seq[symbol] = seq
+
             self.data[symbol].append(tick)
+            self.tick_times[symbol].append(epoch)
+            self.tick_seqs[symbol].append(seq)
+            self.tick_sizes[symbol].append(size)
+            self.memory_used[symbol] += size
+
+            for bar_type, builder in self.info_bars[symbol].items():
+                bar = builder.update(tick, seq)
+                if bar is not None:
+                    bar_size = _estimate_size(bar)
+                    self.info_bar_sizes[symbol][bar_type].append(bar_size)
+                    self.info_bar_bytes[symbol][bar_type] += bar_size
+                    self.memory_used[symbol] += bar_size
+
+            if is_new:
+                # Budget share shrinks for everyone when a symbol joins
+                for s in list(self.data.keys()):
+                    self._enforce_retention(s)
+            else:
+                self._enforce_retention(symbol)
 
             # Persist tick
             self.conn.execute(
@@ -68,6 +215,105 @@ class MarketState:
             )
             self.conn.commit()
 
+    def _new_bar_builders(self):
+        return {
+            # Unbounded here; _enforce_retention trims against the budget
+            bar_type: InformationBarBuilder(
+                bar_type,
+                self.bar_thresholds[bar_type],
+                max_bars=None
+            )
+            for bar_type in BAR_TYPES
+        }
+
+    # -----------------------------
+    # RETENTION (caller holds lock)
+    # -----------------------------
+    def _symbol_budget(self):
+        return self.memory_budget_bytes // max(1, len(self.data))
+
+    def _enforce_retention(self, symbol):
+        """
+        Cap information bars at info_bar_share of the symbol's share of the
+        memory budget (and max_info_bars per type). Then downsample raw
+        ticks older than retention_seconds (or over budget) into archive
+        bars, and drop archive bars that are past bar_retention_seconds or
+        still over budget.
+        """
+        ticks = self.data[symbol]
+        times = self.tick_times[symbol]
+        if not times:
+            return
+
+        now = times[-1]
+        budget = self._symbol_budget()
+
+        info_budget = budget * self.info_bar_share / len(BAR_TYPES)
+        for bar_type, builder in self.info_bars[symbol].items():
+            sizes = self.info_bar_sizes[symbol][bar_type]
+            while builder.bars and (
+                len(builder.bars) > self.max_info_bars
+                or self.info_bar_bytes[symbol][bar_type] > info_budget
+            ):
+                builder.bars.popleft()
+                freed = sizes.popleft()
+                self.info_bar_bytes[symbol][bar_type] -= freed
+                self.memory_used[symbol] -= freed
+                self.info_trim[symbol][bar_type] = self.sequence
+
+        tick_cutoff = now - self.retention_seconds
+        while len(ticks) > 1 and (
+            times[0] < tick_cutoff or self.memory_used[symbol] > budget
+        ):
+            epoch = times.popleft()
+            self._archive_tick(
+                symbol,
+                ticks.popleft(),
+                epoch,
+                self.tick_seqs[symbol].popleft()
+            )
+            self.memory_used[symbol] -= self.tick_sizes[symbol].popleft()
+            self.tick_trim[symbol] = (epoch, self.sequence)
+
+        bars = self.archive[symbol]
+        bar_cutoff = now - self.bar_retention_seconds
+        while bars and (
+            bars[0]["start"] < bar_cutoff or self.memory_used[symbol] > budget
+        ):
+            dropped = bars.popleft()
+            self.memory_used[symbol] -= self.bar_sizes[symbol].popleft()
+            self.archive_trim[symbol] = (
+                dropped["start"] + self.bar_seconds - 1e-9, self.sequence
+            )
+
+    def _archive_tick(self, symbol, tick, epoch, seq):
+        bars = self.archive[symbol]
+        start = epoch - (epoch % self.bar_seconds)
+        price = tick["price"]
+
+        if bars and start <= bars[-1]["start"]:
+            bar = bars[-1]
+            bar["high"] = max(bar["high"], price)
+            bar["low"] = min(bar["low"], price)
+            bar["close"] = price
+            bar["volume"] += tick["qty"]
+            bar["seq"] = max(bar["seq"], seq)
+            return
+
+        bar = {
+            "start": start,
+            "open": price,
+            "high": price,
+            "low": price,
+            "close": price,
+            "volume": tick["qty"],
+            "seq": seq
+        }
+        size = _estimate_size(bar)
+        bars.append(bar)
+        self.bar_sizes[symbol].append(size)
+        self.memory_used[symbol] += size
+
     # -----------------------------
     # RAW ACCESS
     # -----------------------------
@@ -85,40 +331,258 @@ class MarketState:
         with self.lock:
             return list(self.data.keys())
 
+    def get_archived_bars(self, symbol):
+        with self.lock:
+            return [dict(bar) for bar in self.archive.get(symbol, [])]
+
+    def get_bars_version(self, symbol, timeframe):
+        """
+        Sequence number of the newest change to a symbol's bar set, O(1).
+
+        Time bars change with every tick and when retention trims them.
+        Information bars change when a bar completes or is trimmed.
+        """
+        with self.lock:
+            if symbol not in self.data:
+                return 0
+            if timeframe in BAR_TYPES:
+                return max(
+                    self.info_bars[symbol][timeframe].last_seq,
+                    self.info_trim[symbol].get(timeframe, 0)
+                )
+            return max(
+                self.latest_seq[symbol],
+                self.tick_trim.get(symbol, (0, 0))[1],
+                self.archive_trim.get(symbol, (0, 0))[1]
+            )
+
+    # -----------------------------
+    # MEMORY / COVERAGE
+    # -----------------------------
+    def get_memory_stats(self):
+        """
+        Per-symbol memory use and the time span covered by raw ticks
+        and by archived bars.
+        """
+        with self.lock:
+            budget = self._symbol_budget()
+            stats = {}
+
+            for symbol, times in self.tick_times.items():
+                bars = self.archive[symbol]
+                tick_span = times[-1] - times[0] if times else 0.0
+                oldest = bars[0]["start"] if bars else (
+                    times[0] if times else None
+                )
+                newest = times[-1] if times else None
+
+                stats[symbol] = {
+                    "ticks": len(times),
+                    "bars": len(bars),
+                    "bytes": self.memory_used[symbol],
+                    "budget_bytes": budget,
+                    "info_bars": {
+                        bar_type: len(builder.bars)
+                        for bar_type, builder in self.info_bars[symbol].items()
+                    },
+                    "info_bar_bytes": sum(self.info_bar_bytes[symbol].values()),
+                    "tick_coverage_seconds": tick_span,
+                    "total_coverage_seconds": (
+                        newest - oldest if newest is not None else 0.0
+                    )
+                }
+
+            return {
+                "budget_bytes": self.memory_budget_bytes,
+                "used_bytes": sum(self.memory_used.values()),
+                "ingested": self.sequence,
+                "symbols": stats
+            }
+
     # -----------------------------
     # RESAMPLING
     # -----------------------------
     def get_resampled(self, symbol, timeframe):
         """
-        timeframe: '1s', '1m', '5m'
+        timeframe: '1s', '1m', '5m' or 'tick', 'volume', 'dollar'
         Returns OHLCV DataFrame
         """
         if symbol not in self.data:
             return None
 
+        if timeframe in BAR_TYPES:
+            return self.get_info_bars(symbol, timeframe)
+
         with self.lock:
             ticks = list(self.data[symbol])
+            seqs = list(self.tick_seqs[symbol])
+            bars = [dict(bar) for bar in self.archive[symbol]]
+            tick_trim = self.tick_trim.get(symbol)
+            archive_trim = self.archive_trim.get(symbol)
 
         if not ticks:
             return None
 
+        # pandas is heavy; keep it off the import / ingest path
+        import pandas as pd
+
         df = pd.DataFrame(ticks)
+        df["seq"] = seqs
         df["ts"] = pd.to_datetime(df["ts"], utc=True, format="ISO8601")
         df.set_index("ts", inplace=True)
 
-        rule = {
-            "1s": "1S",
-            "1m": "1T",
-            "5m": "5T"
-        }[timeframe]
+        rule = TIME_RULES[timeframe]
+        ohlcv = _resample_ticks(df, timeframe)
+
+        # Archived bars only extend timeframes at least as coarse as they are
+        uses_archive = (
+            pd.Timedelta(rule) >= pd.Timedelta(seconds=self.bar_seconds)
+        )
+        if bars and uses_archive:
+            ohlcv = self._merge_archive(bars, ohlcv, rule)
 
-        ohlcv = df["price"].resample(rule).ohlc()
-        ohlcv["volume"] = df["qty"].resample(rule).sum()
-        ohlcv.dropna(inplace=True)
+        # The oldest bar loses data when retention trims inside its bucket;
+        # give it the trim's seq so since= clients pick up the change
+        trim = archive_trim if uses_archive else tick_trim
+        if trim is not None and len(ohlcv):
+            epoch, seq = trim
+            first = ohlcv.index[0]
+            trimmed_at = pd.Timestamp(epoch, unit="s", tz="UTC")
+            if first <= trimmed_at < first + pd.Timedelta(rule):
+                ohlcv.iloc[0, ohlcv.columns.get_loc("seq")] = max(
+                    int(ohlcv["seq"].iloc[0]), seq
+                )
 
         self.resampled[timeframe][symbol] = ohlcv
         return ohlcv
 
+    def get_info_bars(self, symbol, bar_type):
+        """
+        Completed tick / volume / dollar bars as an OHLCV DataFrame,
+        indexed by the timestamp of each bar's closing tick.
+        """
+        with self.lock:
+            if symbol not in self.info_bars:
+                return None
+            bars = self.info_bars[symbol][bar_type].get_bars()
+
+        if not bars:
+            return None
+
+        import pandas as pd
+
+        df = pd.DataFrame(bars)
+        df["ts"] = pd.to_datetime(df["ts"], utc=True, format="ISO8601")
+        df["start"] = pd.to_datetime(df["start"], utc=True, format="ISO8601")
+        df.set_index("ts", inplace=True)
+
+        self.resampled[bar_type][symbol] = df
+        return df
+
+    def load_history(self, symbol, timeframe, since=None, until=None):
+        """
+        OHLCV bars rebuilt from the persisted ticks table, covering more
+        history than the in-memory buffers hold.
+
+        since / until: optional ISO8601 bounds on tick ts
+        (raises ValueError if unparseable)
+        """
+        query = "SELECT ts, price, qty FROM ticks WHERE symbol = ?"
+        params = [symbol]
+        if since:
+            query += " AND ts >= ?"
+            params.append(_to_db_ts(since))
+        if until:
+            query += " AND ts <= ?"
+            params.append(_to_db_ts(until))
+
+        # Separate connection so a long read doesn't hold up ingestion
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(query + " ORDER BY ts", params).fetchall()
+        finally:
+            conn.close()
+
+        if not rows:
+            return None
+
+        import pandas as pd
+
+        if timeframe in BAR_TYPES:
+            builder = InformationBarBuilder(
+                timeframe,
+                self.bar_thresholds[timeframe],
+                max_bars=len(rows)
+            )
+            for ts, price, qty in rows:
+                builder.update({"ts": ts, "price": price, "qty": qty})
+
+            bars = builder.get_bars()
+            if not bars:
+                return None
+
+            df = pd.DataFrame(bars)
+            df["ts"] = pd.to_datetime(df["ts"], utc=True, format="ISO8601")
+            return df.set_index("ts")
+
+        df = pd.DataFrame(rows, columns=["ts", "price", "qty"])
+        df["ts"] = pd.to_datetime(df["ts"], utc=True, format="ISO8601")
+        df.set_index("ts", inplace=True)
+
+        return _resample_ticks(df, timeframe)
+
+    def get_pair_series(self, symbol_a, symbol_b, timeframe="1s",
+                        source="memory", since=None, until=None):
+        """
+        Close series for a pair, ready for the analytics functions.
+        source: 'memory' (live buffers) or 'db' (ticks table)
+        since / until: ISO8601 bounds, only used with source='db'
+
+        Time bars already share a grid. Information bars close at
+        different instants per symbol, so symbol_b is sampled at
+        symbol_a's bar closes using its last known close.
+        """
+        if source == "db":
+            bars_a = self.load_history(symbol_a, timeframe, since, until)
+            bars_b = self.load_history(symbol_b, timeframe, since, until)
+            s1 = bars_a["close"] if bars_a is not None else None
+            s2 = bars_b["close"] if bars_b is not None else None
+        else:
+            s1 = self.get_price_series(symbol_a, timeframe)
+            s2 = self.get_price_series(symbol_b, timeframe)
+
+        if timeframe not in BAR_TYPES or s1 is None or s2 is None:
+            return s1, s2
+
+        s1 = s1[~s1.index.duplicated(keep="last")]
+        s2 = s2[~s2.index.duplicated(keep="last")]
+        s2 = s2.reindex(s2.index.union(s1.index)).ffill().reindex(s1.index)
+
+        return s1, s2.dropna()
+
+    @staticmethod
+    def _merge_archive(bars, ohlcv, rule):
+        import pandas as pd
+
+        agg = {
+            "open": "first",
+            "high": "max",
+            "low": "min",
+            "close": "last",
+            "volume": "sum",
+            "seq": "max"
+        }
+
+        archived = pd.DataFrame(bars)
+        archived["ts"] = pd.to_datetime(archived.pop("start"), unit="s", utc=True)
+        archived.set_index("ts", inplace=True)
+        archived = archived.resample(rule).agg(agg).dropna()
+
+        # A bucket straddling the archive/raw boundary is merged, archive first
+        combined = pd.concat([archived, ohlcv])
+        merged = combined.groupby(level=0, sort=True).agg(agg)
+        return merged.astype({"seq": "int64"})
+
     # -----------------------------
     # ANALYTICS HELPERS
     # -----------------------------
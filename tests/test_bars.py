@@ -0,0 +1,74 @@
+import pytest
+
+from resampling.bars import InformationBarBuilder
+
+
+def tick(i, price=10.0, qty=1.0):
+    return {
+        "ts": f"2024-01-01T00:00:{i:02d}+00:00",
+        "symbol": "x",
+        "price": price,
+        "qty": qty
+    }
+
+
+def feed(builder, ticks):
+    closed = []
+    for seq, t in enumerate(ticks, start=1):
+        bar = builder.update(t, seq)
+        if bar is not None:
+            closed.append((seq, bar))
+    return closed
+
+
+def test_tick_bars_close_every_threshold_trades():
+    builder = InformationBarBuilder("tick", 3)
+    closed = feed(builder, [tick(i, price=10 + i) for i in range(10)])
+
+    assert [seq for seq, _ in closed] == [3, 6, 9]
+    first = closed[0][1]
+    assert first["ticks"] == 3
+    assert (first["open"], first["high"], first["low"], first["close"]) == (
+        10, 12, 10, 12
+    )
+    assert first["start"] == tick(0)["ts"]
+    assert first["ts"] == tick(2)["ts"]
+    assert builder.current["ticks"] == 1
+    assert builder.last_seq == 9
+
+
+def test_volume_bars_close_when_quantity_reaches_threshold():
+    builder = InformationBarBuilder("volume", 5.0)
+    qtys = [2.0, 2.0, 0.5, 0.5, 4.0, 1.0, 3.0]
+    closed = feed(builder, [tick(i, qty=q) for i, q in enumerate(qtys)])
+
+    # 2 + 2 + 0.5 + 0.5 reaches 5 exactly; 4 + 1 does too; 3 stays open
+    assert [seq for seq, _ in closed] == [4, 6]
+    assert [bar["volume"] for _, bar in closed] == [5.0, 5.0]
+    assert builder.current["volume"] == 3.0
+
+
+def test_dollar_bars_close_when_notional_reaches_threshold():
+    builder = InformationBarBuilder("dollar", 100.0)
+    closed = feed(builder, [
+        tick(0, price=20.0, qty=2.0),
+        tick(1, price=25.0, qty=2.0),
+        tick(2, price=30.0, qty=1.0),
+        tick(3, price=50.0, qty=3.0)
+    ])
+
+    # 40 + 50 = 90 < 100, + 30 closes; a single 150 trade closes alone
+    assert [seq for seq, _ in closed] == [3, 4]
+    assert closed[0][1]["dollar_volume"] == 120.0
+    assert closed[1][1]["ticks"] == 1
+    assert builder.current is None
+
+
+@pytest.mark.parametrize("bar_type, threshold", [
+    ("time", 10),
+    ("tick", 0),
+    ("volume", -1.0)
+])
+def test_rejects_bad_bar_type_or_threshold(bar_type, threshold):
+    with pytest.raises(ValueError):
+        InformationBarBuilder(bar_type, threshold)
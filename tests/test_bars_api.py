@@ -0,0 +1,135 @@
+from datetime import datetime, timezone
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+import backend.api as api
+from resampling.bars import BAR_TYPES
+from state.market_state import MarketState
+
+START = 1_700_000_000.0
+
+
+def tick(symbol, offset, price=100.0, qty=1.0):
+    return {
+        "ts": datetime.fromtimestamp(START + offset, tz=timezone.utc).isoformat(),
+        "symbol": symbol,
+        "price": price,
+        "qty": qty
+    }
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    # The lifespan opens ticks.db in the working directory
+    monkeypatch.chdir(tmp_path)
+    with TestClient(api.app) as c:
+        yield c
+
+
+@pytest.fixture
+def state(client, monkeypatch):
+    state = MarketState(db_path=":memory:")
+    monkeypatch.setattr(api, "market_state", state)
+    return state
+
+
+def get_bars(client, timeframe="1s", headers=None, **params):
+    return client.get(
+        "/bars",
+        params={"symbol": "x", "timeframe": timeframe, **params},
+        headers=headers or {}
+    )
+
+
+def bar_times(payload):
+    return set(pd.to_datetime(list(payload["data"].get("open", {}))))
+
+
+def test_since_returns_exactly_the_changed_bars(client, state):
+    for i in range(30):
+        state.add_tick(tick("x", i, price=100 + i))
+    first = get_bars(client).json()
+    assert first["bars"] == 30
+
+    # One update to the newest bar, plus two new bars
+    for offset in (29.5, 30.2, 31.7):
+        state.add_tick(tick("x", offset, price=50.0))
+
+    delta = get_bars(client, since=first["seq"], epoch=first["epoch"]).json()
+
+    full = state.get_resampled("x", "1s")
+    changed = full[full["seq"] > first["seq"]]
+    assert len(changed) == 3
+    assert bar_times(delta) == set(changed.index)
+    assert delta["truncated"] is False
+    assert delta["seq"] == state.get_bars_version("x", "1s")
+
+
+def test_matching_etag_gets_304_until_the_bars_change(client, state):
+    for i in range(5):
+        state.add_tick(tick("x", i))
+
+    r = get_bars(client)
+    etag = r.headers["ETag"]
+    assert get_bars(client, headers={"If-None-Match": etag}).status_code == 304
+
+    state.add_tick(tick("x", 5))
+    r = get_bars(client, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+
+
+def test_etag_changes_when_info_bars_are_trimmed(client, monkeypatch):
+    state = MarketState(bar_thresholds={"tick": 1}, db_path=":memory:")
+    monkeypatch.setattr(api, "market_state", state)
+
+    for i in range(20):
+        state.add_tick(tick("x", i, price=100 + i))
+
+    # Enough budget for x's tick bars alone, not once a second symbol
+    # halves the per-symbol share
+    info_bytes = state.info_bar_bytes["x"]["tick"]
+    state.memory_budget_bytes = int(
+        info_bytes * len(BAR_TYPES) / state.info_bar_share * 1.5
+    )
+
+    before = get_bars(client, "tick")
+    last_bar = state.info_bars["x"]["tick"].last_seq
+
+    state.add_tick(tick("y", 20))
+
+    # No new x bar closed; the version moved because bars were dropped
+    assert state.info_bars["x"]["tick"].last_seq == last_bar
+    after = get_bars(client, "tick", headers={
+        "If-None-Match": before.headers["ETag"]
+    })
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert after.json()["bars"] < before.json()["bars"]
+    assert pd.Timestamp(after.json()["oldest"]) > pd.Timestamp(
+        before.json()["oldest"]
+    )
+
+
+@pytest.mark.parametrize("stale", ["epoch", "seq"])
+def test_untrusted_since_gets_a_full_resend(client, state, stale):
+    for i in range(10):
+        state.add_tick(tick("x", i))
+    current = get_bars(client).json()
+
+    params = {"since": current["seq"], "epoch": current["epoch"]}
+    if stale == "epoch":
+        params["epoch"] = "previous-process"
+    else:
+        params["since"] = current["seq"] + 1_000
+
+    delta = get_bars(client, **params).json()
+    assert delta["truncated"] is True
+    assert bar_times(delta) == bar_times(current)
+    assert len(bar_times(delta)) == 10
@@ -0,0 +1,121 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from state.market_state import MarketState, _resample_ticks, _to_db_ts
+
+START = 1_700_000_000.0
+OHLCV = ["open", "high", "low", "close", "volume"]
+
+
+def make_ticks(symbol, count, step=0.7, seed=3):
+    rng = random.Random(seed)
+    price = 100.0
+    ticks = []
+    for i in range(count):
+        price += rng.gauss(0, 0.05)
+        ticks.append({
+            "ts": datetime.fromtimestamp(START + i * step, tz=timezone.utc).isoformat(),
+            "symbol": symbol,
+            "price": round(price, 4),
+            "qty": round(rng.uniform(0.01, 2.0), 3)
+        })
+    return ticks
+
+
+def resample_all(ticks, timeframe):
+    df = pd.DataFrame(ticks)
+    df["ts"] = pd.to_datetime(df["ts"], utc=True, format="ISO8601")
+    df.set_index("ts", inplace=True)
+    return _resample_ticks(df, timeframe)
+
+
+def assert_archive_matches_full_resample(state, ticks):
+    for timeframe in ("1m", "5m"):
+        got = state.get_resampled("x", timeframe)[OHLCV]
+        expected = resample_all(ticks, timeframe)[OHLCV]
+        pd.testing.assert_frame_equal(got, expected, check_freq=False)
+
+
+def assert_memory_consistent(state):
+    for symbol in state.get_symbols():
+        info_bytes = 0
+        for bar_type, builder in state.info_bars[symbol].items():
+            sizes = state.info_bar_sizes[symbol][bar_type]
+            assert len(sizes) == len(builder.bars)
+            assert state.info_bar_bytes[symbol][bar_type] == sum(sizes)
+            info_bytes += sum(sizes)
+
+        assert len(state.tick_sizes[symbol]) == len(state.data[symbol])
+        assert len(state.bar_sizes[symbol]) == len(state.archive[symbol])
+        assert state.memory_used[symbol] == (
+            sum(state.tick_sizes[symbol])
+            + sum(state.bar_sizes[symbol])
+            + info_bytes
+        )
+
+    assert state.get_memory_stats()["used_bytes"] == sum(
+        state.memory_used.values()
+    )
+
+
+def test_time_eviction_folds_ticks_into_archive_bars():
+    state = MarketState(retention_seconds=120, db_path=":memory:")
+    ticks = make_ticks("x", 1_200)
+    for tick in ticks:
+        state.add_tick(tick)
+
+    assert len(state.get_ticks("x")) < len(ticks)
+    assert state.get_archived_bars("x")
+    assert_archive_matches_full_resample(state, ticks)
+
+
+def test_budget_eviction_folds_ticks_into_archive_bars():
+    state = MarketState(memory_budget_bytes=60_000, db_path=":memory:")
+    ticks = make_ticks("x", 1_200)
+    for tick in ticks:
+        state.add_tick(tick)
+
+    # Nothing is old enough for time retention; the budget did the evicting
+    assert len(state.get_ticks("x")) < len(ticks)
+    assert "x" not in state.archive_trim
+    assert state.memory_used["x"] <= state.memory_budget_bytes
+    assert_archive_matches_full_resample(state, ticks)
+
+
+def test_memory_used_stays_consistent_after_evictions():
+    state = MarketState(
+        retention_seconds=60,
+        bar_retention_seconds=300,
+        memory_budget_bytes=80_000,
+        bar_thresholds={"tick": 5, "volume": 3.0, "dollar": 300.0},
+        db_path=":memory:"
+    )
+
+    for tick in make_ticks("x", 1_500):
+        state.add_tick(tick)
+    assert_memory_consistent(state)
+
+    # A new symbol halves everyone's share of the budget
+    for tick in make_ticks("y", 300, seed=4):
+        state.add_tick(tick)
+    assert_memory_consistent(state)
+
+    assert "x" in state.archive_trim
+    assert any(
+        len(builder.bars) for builder in state.info_bars["x"].values()
+    )
+    for symbol in ("x", "y"):
+        assert state.memory_used[symbol] <= state.memory_budget_bytes // 2
+
+
+@pytest.mark.parametrize("bound", [
+    "2024-01-01T00:00:00",
+    "2024-01-01T00:00:00+00:00",
+    "2024-01-01T02:00:00+02:00"
+])
+def test_db_bounds_are_normalized_to_utc(bound):
+    assert _to_db_ts(bound) == "2024-01-01T00:00:00+00:00"
@@ -0,0 +1,163 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("statsmodels")
+
+from alerts.rules import zscore_alert
+from analytics.adf_test import adf_test
+from analytics.correlation import rolling_correlation
+from analytics.hedge_ratio import compute_hedge_ratio
+from analytics.spread import compute_spread
+from analytics.sweep import _window_stats, parameter_sweep
+from analytics.zscore import compute_zscore
+
+WINDOWS = [5, 20, 40]
+Z_THRESH = [1.0, 1.75]
+CORR_THRESH = [0.2, 0.8]
+HORIZON = 5
+CALIBRATION = 0.3
+
+
+@pytest.fixture
+def pair():
+    rng = np.random.default_rng(7)
+    index = pd.date_range("2024-01-01", periods=240, freq="1min", tz="UTC")
+    a = 100 + np.cumsum(rng.normal(0, 0.5, len(index)))
+    b = 0.5 * a + 20 + rng.normal(0, 0.4, len(index))
+    return pd.Series(a, index=index), pd.Series(b, index=index)
+
+
+def test_window_stats_match_live_analytics(pair):
+    s1, s2 = pair
+    spread = compute_spread(s1, s2, compute_hedge_ratio(s1, s2))
+    z, corr = _window_stats(
+        spread.to_numpy(), s1.to_numpy(), s2.to_numpy(), WINDOWS
+    )
+
+    for i, window in enumerate(WINDOWS):
+        for t in range(len(spread)):
+            expected_z = compute_zscore(spread.iloc[:t + 1], window)
+            expected_corr = rolling_correlation(
+                s1.iloc[:t + 1], s2.iloc[:t + 1], window
+            )
+
+            if expected_z is None:
+                assert math.isnan(z[i, t])
+            else:
+                assert z[i, t] == pytest.approx(expected_z, abs=1e-7)
+
+            if expected_corr is None:
+                assert math.isnan(corr[i, t])
+            else:
+                assert corr[i, t] == pytest.approx(expected_corr, abs=1e-7)
+
+
+def test_counts_match_per_bar_zscore_alert(pair):
+    s1, s2 = pair
+    start = int(len(s1) * CALIBRATION)
+    hedge = compute_hedge_ratio(s1.iloc[:start], s2.iloc[:start])
+    spread = compute_spread(s1, s2, hedge)
+    _, p_value = adf_test(spread.iloc[:start])
+    p_thresholds = [0.0, 1.0]
+
+    result = parameter_sweep(
+        s1, s2, WINDOWS, Z_THRESH, CORR_THRESH, p_thresholds,
+        horizon=HORIZON, calibration=CALIBRATION
+    )
+    assert result["hedge_ratio"] == pytest.approx(hedge)
+    assert result["calibration_bars"] == start
+    assert result["scored_from"] == s1.index[start]
+    cells = {
+        (r["window"], r["z_thresh"], r["corr_thresh"], r["p_thresh"]): r
+        for r in result["results"]
+    }
+    assert len(cells) == len(WINDOWS) * len(Z_THRESH) * len(CORR_THRESH) * 2
+
+    n = len(spread)
+    for window in WINDOWS:
+        stats = [
+            (
+                compute_zscore(spread.iloc[:t + 1], window),
+                rolling_correlation(s1.iloc[:t + 1], s2.iloc[:t + 1], window)
+            )
+            for t in range(n)
+        ]
+
+        for z_thresh in Z_THRESH:
+            for corr_thresh in CORR_THRESH:
+                for p_thresh in p_thresholds:
+                    signals = hits = scored = 0
+                    for t, (z, corr) in enumerate(stats):
+                        if t < start:
+                            continue
+                        if not zscore_alert(z, p_value, corr, z_thresh=z_thresh,
+                                            corr_thresh=corr_thresh,
+                                            p_thresh=p_thresh):
+                            continue
+                        signals += 1
+                        if t + HORIZON < n:
+                            scored += 1
+                            move = spread.iloc[t + HORIZON] - spread.iloc[t]
+                            hits += -np.sign(z) * move > 0
+
+                    cell = cells[(window, z_thresh, corr_thresh, p_thresh)]
+                    assert cell["signals"] == signals
+                    assert cell["hits"] == hits
+                    if scored:
+                        assert cell["hit_rate"] == pytest.approx(hits / scored)
+                    else:
+                        assert cell["hit_rate"] is None
+
+
+def test_process_pool_matches_serial(pair):
+    s1, s2 = pair
+    args = (s1, s2, WINDOWS, Z_THRESH, CORR_THRESH, [1.0])
+
+    serial = parameter_sweep(*args)
+    pooled = parameter_sweep(*args, max_workers=2, parallel_min_cells=0)
+
+    assert pooled["results"] == serial["results"]
+
+
+def test_fit_ignores_bars_after_calibration(pair):
+    s1, s2 = pair
+    start = int(len(s1) * CALIBRATION)
+    shocked = s1.copy()
+    shocked.iloc[start:] += 50
+
+    before = parameter_sweep(s1, s2, WINDOWS, Z_THRESH, CORR_THRESH, [1.0])
+    after = parameter_sweep(shocked, s2, WINDOWS, Z_THRESH, CORR_THRESH, [1.0])
+
+    assert after["hedge_ratio"] == before["hedge_ratio"]
+    assert after["p_value"] == before["p_value"]
+
+
+@pytest.mark.parametrize("calibration", [0.0, 1.0, 1.5])
+def test_rejects_calibration_outside_unit_interval(pair, calibration):
+    s1, s2 = pair
+    with pytest.raises(ValueError):
+        parameter_sweep(s1, s2, WINDOWS, Z_THRESH, CORR_THRESH, [1.0],
+                        calibration=calibration)
+
+
+@pytest.mark.parametrize("horizon", [0, -3])
+def test_rejects_non_positive_horizon(pair, horizon):
+    s1, s2 = pair
+    with pytest.raises(ValueError):
+        parameter_sweep(s1, s2, WINDOWS, Z_THRESH, CORR_THRESH, [1.0],
+                        horizon=horizon)
+
+
+def test_horizon_beyond_history_counts_signals_without_scoring(pair):
+    s1, s2 = pair
+    result = parameter_sweep(s1, s2, [20], [0.0], [-1.0], [1.0],
+                             horizon=len(s1))
+
+    cell = result["results"][0]
+    assert cell["signals"] > 0
+    assert cell["hits"] == 0
+    assert cell["hit_rate"] is None
+    assert cell["avg_reversion"] is None
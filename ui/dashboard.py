@@ -1,9 +1,9 @@
 import time
 import requests
 import pandas as pd
-import numpy as np
 import streamlit as st
-import plotly.graph_objects as go
+
+_render_start = time.perf_counter()
 
 # =================================================
 # Page Config
@@ -28,6 +28,48 @@ def api_get(path, params=None):
     r.raise_for_status()
     return r.json()
 
+def fetch_bars(symbol, timeframe):
+    """
+    Incremental /bars poll. Sends the last seen seq and ETag, and merges
+    only new or updated bars into the frame cached in session state.
+    """
+    key = f"bars_{symbol}_{timeframe}"
+    cache = st.session_state.get(key)
+
+    params = {"symbol": symbol, "timeframe": timeframe}
+    headers = {}
+    if cache is not None:
+        params["since"] = cache["seq"]
+        params["epoch"] = cache["epoch"]
+        if cache["etag"]:
+            headers["If-None-Match"] = cache["etag"]
+
+    r = requests.get(f"{BACKEND_URL}/bars", params=params, headers=headers, timeout=5)
+    if r.status_code == 304:
+        return cache["data"]
+    r.raise_for_status()
+    payload = r.json()
+
+    df = pd.DataFrame(payload["data"])
+    if not df.empty:
+        df.index = pd.to_datetime(df.index)
+    # A truncated response (too many changes, or a restarted backend)
+    # already holds the newest 100 bars, so it replaces the cache
+    if cache is not None and not cache["data"].empty and not payload["truncated"]:
+        df = pd.concat([cache["data"], df])
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+    if payload["oldest"] is not None and not df.empty:
+        df = df[df.index >= pd.to_datetime(payload["oldest"])]
+    df = df.tail(100)
+
+    st.session_state[key] = {
+        "seq": payload["seq"],
+        "epoch": payload["epoch"],
+        "etag": r.headers.get("ETag"),
+        "data": df
+    }
+    return df
+
 def compute_signal_score(z, corr, p_value, z_thresh):
     if z is None or corr is None or p_value is None:
         return None
@@ -43,6 +85,8 @@ def compute_half_life(spread: pd.Series):
     if spread is None or len(spread) < 10:
         return None
 
+    import numpy as np
+
     spread_lag = spread.shift(1).dropna()
     delta = spread.diff().dropna()
 
@@ -85,8 +129,8 @@ if time.time() - st.session_state.last_refresh > refresh:
 # Fetch Backend Data
 # =================================================
 try:
-    bars_a = api_get("/bars", {"symbol": symbol_a, "timeframe": timeframe})
-    bars_b = api_get("/bars", {"symbol": symbol_b, "timeframe": timeframe})
+    df_a = fetch_bars(symbol_a, timeframe)
+    df_b = fetch_bars(symbol_b, timeframe)
     zdata = api_get("/analytics/zscore", {
         "symbol_a": symbol_a,
         "symbol_b": symbol_b,
@@ -117,15 +161,10 @@ except Exception as e:
 # =================================================
 # DataFrames
 # =================================================
-df_a = pd.DataFrame(bars_a["data"])
-df_b = pd.DataFrame(bars_b["data"])
-
 if df_a.empty or df_b.empty:
     st.warning("Waiting for data...")
     st.stop()
 
-df_a.index = pd.to_datetime(df_a.index)
-df_b.index = pd.to_datetime(df_b.index)
 df = df_a.join(df_b, lsuffix="_a", rsuffix="_b", how="inner")
 
 # =================================================
@@ -198,6 +237,12 @@ if alert["triggered"] and signal_score is not None:
 # =================================================
 # Price Chart
 # =================================================
+# plotly is only needed once there is data to draw. Streamlit keeps it in
+# sys.modules afterwards, so only the first run with data pays this.
+_plotly_start = time.perf_counter()
+import plotly.graph_objects as go
+_plotly_import_ms = (time.perf_counter() - _plotly_start) * 1000
+
 st.markdown("## 📈 Market Prices")
 price_fig = go.Figure()
 price_fig.add_trace(go.Scatter(x=df.index, y=df["close_a"], name=symbol_a.upper()))
@@ -245,3 +290,7 @@ st.plotly_chart(z_fig, use_container_width=True)
 # =================================================
 st.markdown("---")
 st.caption("Quant-grade pair trading dashboard • Backend-driven analytics")
+st.caption(
+    f"Rendered in {(time.perf_counter() - _render_start) * 1000:.0f} ms "
+    f"(plotly import {_plotly_import_ms:.0f} ms)"
+)